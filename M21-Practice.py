@@ -1,22 +1,32 @@
-from music21 import note, stream, environment
+import argparse
 
 
-us = environment.UserSettings()
-us['musicxmlPath'] = '//Applications/MuseScore 4.app'
-us['musescoreDirectPNGPath'] = '/Applications/MuseScore 4.app'
+def _demo(show: bool = False) -> None:
+    # Lazy import: pulling in music21 (and its environment setup) is slow
+    # and should only happen when the demo actually runs
+    from music21 import note, stream, environment
 
-s = stream.Stream()
-s.append(note.Note('C4', quarterLength=1))
-s.append(note.Note('E4', quarterLength=1))
-s.append(note.Note('G4', quarterLength=1))
+    us = environment.UserSettings()
+    us['musicxmlPath'] = '//Applications/MuseScore 4.app'
+    us['musescoreDirectPNGPath'] = '/Applications/MuseScore 4.app'
 
-# Just write to MIDI - this doesn't need MuseScore at all
-s.write('midi', fp='test.mid')
-print("MIDI file created successfully!")
+    s = stream.Stream()
+    s.append(note.Note('C4', quarterLength=1))
+    s.append(note.Note('E4', quarterLength=1))
+    s.append(note.Note('G4', quarterLength=1))
 
+    # Just write to MIDI - this doesn't need MuseScore at all
+    s.write('midi', fp='test.mid')
+    print("MIDI file created successfully!")
 
+    if show:
+        # show() spawns MuseScore, so it stays opt-in
+        s.show()
 
 
-n1 = note.Note('C4')
-#n1.show()
-s.show()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="music21 scratch demo")
+    parser.add_argument("--show", action="store_true",
+                        help="open the stream in MuseScore after writing")
+    args = parser.parse_args()
+    _demo(show=args.show)
@@ -16,46 +16,82 @@ sys.path.insert(0, str(Path(__file__).parent))
 from generators.midi_generator import generate_batch, SequenceConfig, MidiSequenceGenerator
 
 
+def _row_tuple(meta: dict) -> tuple:
+    """Flatten one metadata dict into the 22-column insert tuple."""
+    from psycopg.types.json import Json
+
+    cfg = meta["config"]
+    stats = meta["stats"]
+    return (
+        meta["id"], meta["filename"], meta["file_path"],
+        cfg["key"], cfg["scale"], cfg["tempo"],
+        cfg["time_signature_num"], cfg["time_signature_den"], cfg["num_bars"],
+        cfg["octave_range"][0], cfg["octave_range"][1], cfg["rhythm_pattern"],
+        cfg["note_duration_variety"], cfg["rest_probability"], cfg["instrument"],
+        cfg["velocity_variation"],
+        stats["note_count"], stats["duration_seconds"],
+        stats["pitch_histogram"],
+        Json(cfg), Json(stats),
+        meta.get("midi_blob"),
+    )
+
+
 def seed_database(metadata_list: list[dict], db_url: str):
-    import psycopg2
-    from psycopg2.extras import Json
+    import psycopg
 
-    conn = psycopg2.connect(db_url)
+    conn = psycopg.connect(db_url)
     cur = conn.cursor()
-    inserted = 0
 
-    for meta in metadata_list:
-        cfg = meta["config"]
-        stats = meta["stats"]
-        try:
-            cur.execute("""
-                INSERT INTO sequences (
-                    id, filename, file_path,
-                    key_signature, scale, tempo,
-                    time_sig_num, time_sig_den, num_bars,
-                    octave_low, octave_high, rhythm_pattern,
-                    duration_variety, rest_probability, instrument,
-                    velocity_variation, note_count, duration_seconds,
-                    pitch_histogram, config_json, stats_json
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s
-                ) ON CONFLICT (id) DO NOTHING
-            """, (
-                meta["id"], meta["filename"], meta["file_path"],
-                cfg["key"], cfg["scale"], cfg["tempo"],
-                cfg["time_signature_num"], cfg["time_signature_den"], cfg["num_bars"],
-                cfg["octave_range"][0], cfg["octave_range"][1], cfg["rhythm_pattern"],
-                cfg["note_duration_variety"], cfg["rest_probability"], cfg["instrument"],
-                cfg["velocity_variation"],
-                stats["note_count"], stats["duration_seconds"],
-                stats["pitch_histogram"],
-                Json(cfg), Json(stats),
-            ))
+    rows = [_row_tuple(meta) for meta in metadata_list]
+
+    # Big seeds stream through COPY — the fastest bulk path Postgres
+    # offers; ids are fresh UUIDs so the ON CONFLICT net isn't needed
+    if len(rows) >= 100:
+        with cur.copy("""
+            COPY sequences (
+                id, filename, file_path,
+                key_signature, scale, tempo,
+                time_sig_num, time_sig_den, num_bars,
+                octave_low, octave_high, rhythm_pattern,
+                duration_variety, rest_probability, instrument,
+                velocity_variation, note_count, duration_seconds,
+                pitch_histogram, config_json, stats_json,
+                midi_blob
+            ) FROM STDIN
+        """) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+        conn.commit()
+        cur.close()
+        conn.close()
+        return len(rows)
+
+    # psycopg3's executemany pipelines all inserts into one round-trip
+    cur.executemany("""
+        INSERT INTO sequences (
+            id, filename, file_path,
+            key_signature, scale, tempo,
+            time_sig_num, time_sig_den, num_bars,
+            octave_low, octave_high, rhythm_pattern,
+            duration_variety, rest_probability, instrument,
+            velocity_variation, note_count, duration_seconds,
+            pitch_histogram, config_json, stats_json,
+            midi_blob
+        ) VALUES (
+            %s, %s, %s, %s, %s, %s, %s, %s, %s,
+            %s, %s, %s, %s, %s, %s, %s, %s, %s,
+            %s, %s, %s, %s
+        ) ON CONFLICT (id) DO NOTHING
+        RETURNING id
+    """, rows, returning=True)
+
+    inserted = 0
+    while True:
+        if cur.fetchone() is not None:  # conflicting ids return an empty set
             inserted += 1
-        except Exception as e:
-            print(f"  ⚠️  Skipped {meta['id']}: {e}")
+        if not cur.nextset():
+            break
 
     conn.commit()
     cur.close()
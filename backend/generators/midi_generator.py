@@ -3,9 +3,13 @@ MIDI Sequence Generator
 Configurable parameters: key, scale, tempo, time signature, length, rhythm patterns
 """
 
+import functools
+import io
+import os
 import random
 import json
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict, field
 from typing import Optional
 from enum import Enum
@@ -13,6 +17,16 @@ from enum import Enum
 import pretty_midi
 import numpy as np
 
+try:
+    import symusic
+except ImportError:
+    symusic = None  # optional fast MIDI writer; we fall back to mido
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None  # optional JIT for the schedule loop; plain Python works too
+
 
 # ─────────────────────────────────────────────
 # Music Theory Constants
@@ -38,15 +52,24 @@ KEY_OFFSETS = {
 }
 
 RHYTHM_PATTERNS = {
-    "straight":    [1.0, 1.0, 1.0, 1.0],
-    "dotted":      [1.5, 0.5, 1.5, 0.5],
-    "syncopated":  [0.5, 1.0, 1.5, 0.5, 0.5],
-    "triplet":     [0.667, 0.667, 0.667],
-    "waltz":       [1.5, 0.75, 0.75],
-    "swing":       [0.75, 0.25, 0.75, 0.25],
+    "straight":    (1.0, 1.0, 1.0, 1.0),
+    "dotted":      (1.5, 0.5, 1.5, 0.5),
+    "syncopated":  (0.5, 1.0, 1.5, 0.5, 0.5),
+    "triplet":     (0.667, 0.667, 0.667),
+    "waltz":       (1.5, 0.75, 0.75),
+    "swing":       (0.75, 0.25, 0.75, 0.25),
     "mixed":       None,  # randomized per bar
 }
 
+# Concrete patterns "mixed" can draw from, built once instead of per bar
+_MIXED_PATTERNS = tuple(v for v in RHYTHM_PATTERNS.values() if v is not None)
+
+# Name tuples for random config sampling, built once instead of
+# list(dict.keys()) per SequenceConfig.random() call
+_KEY_NAMES = tuple(KEY_OFFSETS)
+_SCALE_NAMES = tuple(SCALE_INTERVALS)
+_RHYTHM_NAMES = tuple(RHYTHM_PATTERNS)
+
 NOTE_DURATIONS = {
     "whole":        4.0,
     "half":         2.0,
@@ -92,14 +115,14 @@ class SequenceConfig:
     @classmethod
     def random(cls) -> "SequenceConfig":
         return cls(
-            key=random.choice(list(KEY_OFFSETS.keys())),
-            scale=random.choice(list(SCALE_INTERVALS.keys())),
+            key=random.choice(_KEY_NAMES),
+            scale=random.choice(_SCALE_NAMES),
             tempo=random.randint(60, 180),
             time_signature_num=random.choice([3, 4, 4, 4, 6]),
             time_signature_den=4,
             num_bars=random.choice([4, 4, 8, 8, 8, 12, 16]),
             octave_range=(random.choice([3, 4]), random.choice([5, 6])),
-            rhythm_pattern=random.choice(list(RHYTHM_PATTERNS.keys())),
+            rhythm_pattern=random.choice(_RHYTHM_NAMES),
             note_duration_variety=random.choice(["low", "medium", "high"]),
             rest_probability=round(random.uniform(0.05, 0.25), 2),
             velocity_variation=random.choice([True, False]),
@@ -126,45 +149,79 @@ DURATION_PROFILES = {
     },
 }
 
+# Per-profile (duration values in beats, normalized probabilities) as
+# ndarrays, so whole sequences can be sampled in one rng.choice call
+_PROFILE_SAMPLERS = {
+    name: (
+        np.array([NOTE_DURATIONS[d] for d in profile]),
+        np.array(list(profile.values())) / sum(profile.values()),
+    )
+    for name, profile in DURATION_PROFILES.items()
+}
+
 
 # ─────────────────────────────────────────────
 # Generator
 # ─────────────────────────────────────────────
 
+@functools.lru_cache(maxsize=512)
+def _scale_notes_cached(key: str, scale: str, lo: int, hi: int) -> tuple[int, ...]:
+    """MIDI note numbers for a key/scale/octave-range combo, cached so
+    repeated configs (e.g. batch generation) skip the nested loops."""
+    root = KEY_OFFSETS[key]
+    intervals = SCALE_INTERVALS[scale]
+    notes = []
+    for octave in range(lo, hi + 1):
+        for interval in intervals:
+            midi_note = (octave + 1) * 12 + root + interval
+            if 21 <= midi_note <= 108:
+                notes.append(midi_note)
+    return tuple(sorted(notes))
+
+
+def _build_schedule(durations_sec, total_bars, bar_duration):
+    """Expand sampled durations into absolute (start, duration) arrays.
+
+    Events fill each bar in order until the bar line (same 0.01s guard
+    as the old loop); the last event in a bar is clipped to it. Returns
+    the arrays plus the number of samples consumed. JIT-compiled with
+    numba when available.
+    """
+    n = durations_sec.shape[0]
+    starts = np.empty(n)
+    durs = np.empty(n)
+    i = 0
+    for bar in range(total_bars):
+        bar_start = bar * bar_duration
+        t = 0.0
+        while t < bar_duration - 0.01 and i < n:
+            d = durations_sec[i]
+            clipped = d if t + d <= bar_duration else bar_duration - t
+            starts[i] = bar_start + t
+            durs[i] = clipped
+            t += d
+            i += 1
+    return starts, durs, i
+
+
+if njit is not None:
+    _build_schedule = njit(cache=True)(_build_schedule)
+
+
 class MidiSequenceGenerator:
     def __init__(self, config: Optional[SequenceConfig] = None):
         self.config = config or SequenceConfig()
 
-    def _get_scale_notes(self) -> list[int]:
-        root = KEY_OFFSETS[self.config.key]
-        intervals = SCALE_INTERVALS[self.config.scale]
-        notes = []
+    def _get_scale_notes(self) -> tuple[int, ...]:
         lo, hi = self.config.octave_range
-        for octave in range(lo, hi + 1):
-            for interval in intervals:
-                midi_note = (octave + 1) * 12 + root + interval
-                if 21 <= midi_note <= 108:
-                    notes.append(midi_note)
-        return sorted(notes)
-
-    def _pick_duration(self) -> float:
-        profile = DURATION_PROFILES.get(self.config.note_duration_variety, DURATION_PROFILES["medium"])
-        names = list(profile.keys())
-        weights = list(profile.values())
-        chosen = random.choices(names, weights=weights, k=1)[0]
-        return NOTE_DURATIONS[chosen]
-
-    def _get_rhythm_pattern(self) -> list[float]:
+        return _scale_notes_cached(self.config.key, self.config.scale, lo, hi)
+
+    def _get_rhythm_pattern(self) -> tuple[float, ...]:
         pattern_key = self.config.rhythm_pattern
         if pattern_key == "mixed":
-            return random.choice([v for k, v in RHYTHM_PATTERNS.items() if v is not None])
+            return random.choice(_MIXED_PATTERNS)
         return RHYTHM_PATTERNS.get(pattern_key, RHYTHM_PATTERNS["straight"])
 
-    def _velocity(self) -> int:
-        if self.config.velocity_variation:
-            return random.randint(55, 110)
-        return 80
-
     def generate(self) -> tuple[pretty_midi.PrettyMIDI, dict]:
         cfg = self.config
         pm = pretty_midi.PrettyMIDI(initial_tempo=cfg.tempo)
@@ -175,47 +232,60 @@ class MidiSequenceGenerator:
         quarter_duration = 60.0 / cfg.tempo  # seconds per quarter note
         bar_duration = beats_per_bar * quarter_duration
 
-        current_time = 0.0
         total_bars = cfg.num_bars
-        note_count = 0
-        pitch_histogram = [0] * 12
-
-        for bar in range(total_bars):
-            bar_start = bar * bar_duration
-            bar_end = bar_start + bar_duration
-            t = bar_start
-
-            while t < bar_end - 0.01:
-                remaining = bar_end - t
-
-                # Rest?
-                if random.random() < cfg.rest_probability:
-                    rest_dur = min(self._pick_duration() * quarter_duration, remaining)
-                    t += rest_dur
-                    continue
-
-                # Pick note
-                note_midi = random.choice(scale_notes)
-                dur_beats = self._pick_duration()
-                dur_sec = min(dur_beats * quarter_duration, remaining)
-
-                # Slight humanization
-                start = t + random.uniform(-0.01, 0.01)
-                end = start + dur_sec * random.uniform(0.85, 0.98)
-
-                note = pretty_midi.Note(
-                    velocity=self._velocity(),
-                    pitch=note_midi,
-                    start=max(0, start),
-                    end=max(start + 0.05, end),
-                )
-                instrument.notes.append(note)
-                pitch_histogram[note_midi % 12] += 1
-                note_count += 1
-                t += dur_sec
+
+        # Pre-sample the whole sequence in bulk NumPy calls; the loop below
+        # only advances time and emits Note objects. Every draw advances t
+        # by at least the shortest duration, which bounds the sample count.
+        dur_values, dur_probs = _PROFILE_SAMPLERS.get(
+            cfg.note_duration_variety, _PROFILE_SAMPLERS["medium"])
+        rng = np.random.default_rng()
+        max_per_bar = int(np.ceil(beats_per_bar / dur_values.min())) + 1
+        n = total_bars * max_per_bar
+
+        rest_flags = rng.random(n) < cfg.rest_probability
+        pitches = rng.choice(np.array(scale_notes), n)
+        durations = rng.choice(dur_values, n, p=dur_probs)
+        humanize = rng.uniform(-0.01, 0.01, n)
+        length_jitter = rng.uniform(0.85, 0.98, n)
+        if cfg.velocity_variation:
+            velocities = rng.integers(55, 111, n)
+        else:
+            velocities = np.full(n, 80)
+
+        # Expand the samples into an absolute time schedule: as many
+        # events as fit before each bar line, last one clipped to it.
+        # Events consume samples contiguously, so the first `i` entries
+        # of every sampled array line up with the grid.
+        starts_sec, durs_sec, i = _build_schedule(
+            durations * quarter_duration, total_bars, bar_duration)
+        starts_sec = starts_sec[:i]
+        durs_sec = durs_sec[:i]
+
+        # Drop rests, humanize, and emit — the only remaining Python loop
+        # is Note construction
+        keep = ~rest_flags[:i]
+        note_starts = starts_sec[keep] + humanize[:i][keep]
+        note_ends = note_starts + durs_sec[keep] * length_jitter[:i][keep]
+        note_starts = np.maximum(0.0, note_starts)
+        note_ends = np.maximum(note_starts + 0.05, note_ends)
+        note_pitches = pitches[:i][keep]
+        note_velocities = velocities[:i][keep]
+
+        # One comprehension bound to the notes list beats repeated
+        # instrument.notes.append lookups from a Python loop
+        instrument.notes = [
+            pretty_midi.Note(velocity=int(v), pitch=int(p), start=float(s), end=float(e))
+            for p, v, s, e in zip(note_pitches, note_velocities, note_starts, note_ends)
+        ]
 
         pm.instruments.append(instrument)
 
+        note_count = int(note_pitches.size)
+        pitch_histogram = np.bincount(
+            note_pitches % 12, minlength=12
+        ).astype(int).tolist()
+
         metadata = {
             "id": str(uuid.uuid4()),
             "config": cfg.to_dict(),
@@ -223,41 +293,102 @@ class MidiSequenceGenerator:
                 "note_count": note_count,
                 "duration_seconds": round(total_bars * beats_per_bar * (60.0 / cfg.tempo), 2),
                 "pitch_histogram": pitch_histogram,
-                "scale_notes_used": scale_notes,
+                "scale_notes_used": list(scale_notes),
             }
         }
 
         return pm, metadata
 
 
+# ─────────────────────────────────────────────
+# MIDI Writer
+# ─────────────────────────────────────────────
+
+def _to_symusic_score(pm: pretty_midi.PrettyMIDI):
+    """Convert a PrettyMIDI object to a symusic Score for C++ serialization."""
+    tpq = pm.resolution
+    _, tempi = pm.get_tempo_changes()
+    qpm = float(tempi[0]) if len(tempi) else 120.0
+    sec_to_tick = tpq * qpm / 60.0
+
+    score = symusic.Score(tpq)
+    score.tempos.append(symusic.Tempo(0, qpm))
+    for inst in pm.instruments:
+        track = symusic.Track(program=inst.program, is_drum=inst.is_drum)
+        for n in inst.notes:
+            track.notes.append(symusic.Note(
+                time=int(n.start * sec_to_tick),
+                duration=max(1, int((n.end - n.start) * sec_to_tick)),
+                pitch=n.pitch,
+                velocity=n.velocity,
+            ))
+        score.tracks.append(track)
+    return score
+
+
+def midi_bytes(pm: pretty_midi.PrettyMIDI) -> bytes:
+    """Serialize to MIDI bytes in memory, preferring symusic's C++ writer.
+
+    When symusic is unavailable we still buffer pm.write through an
+    in-memory BytesIO: mido otherwise issues many small writes per file,
+    which adds up across large batches — especially on network
+    filesystems.
+    """
+    if symusic is not None:
+        return bytes(_to_symusic_score(pm).dumps_midi())
+    buf = io.BytesIO()
+    pm.write(buf)
+    return buf.getvalue()
+
+
+def write_midi(pm: pretty_midi.PrettyMIDI, filepath: str) -> None:
+    """Write a MIDI file in a single buffered write."""
+    with open(filepath, "wb") as f:
+        f.write(midi_bytes(pm))
+
+
 # ─────────────────────────────────────────────
 # Batch Generator
 # ─────────────────────────────────────────────
 
+def generate_one(args: tuple) -> dict:
+    """Generate and write one sequence. Top-level so it is picklable for
+    the process pool."""
+    randomize, output_dir = args
+    config = SequenceConfig.random() if randomize else SequenceConfig()
+    gen = MidiSequenceGenerator(config)
+    pm, metadata = gen.generate()
+
+    filename = f"{metadata['id']}.mid"
+    filepath = os.path.join(output_dir, filename)
+    data = midi_bytes(pm)
+    with open(filepath, "wb") as f:
+        f.write(data)
+    metadata["midi_blob"] = data  # persisted to Postgres by the bulk insert
+    metadata["file_path"] = filepath
+    metadata["filename"] = filename
+    return metadata
+
+
 def generate_batch(count: int, output_dir: str = "sequences", randomize: bool = True) -> list[dict]:
-    import os
     os.makedirs(output_dir, exist_ok=True)
     results = []
 
-    for i in range(count):
-        config = SequenceConfig.random() if randomize else SequenceConfig()
-        gen = MidiSequenceGenerator(config)
-        pm, metadata = gen.generate()
+    # Generation is pure CPU work per sequence — fan out across cores
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as ex:
+        args = [(randomize, output_dir)] * count
+        for i, metadata in enumerate(ex.map(generate_one, args, chunksize=8)):
+            results.append(metadata)
+            if (i + 1) % 10 == 0:
+                print(f"Generated {i + 1}/{count} sequences...")
 
-        filename = f"{metadata['id']}.mid"
-        filepath = os.path.join(output_dir, filename)
-        pm.write(filepath)
-        metadata["file_path"] = filepath
-        metadata["filename"] = filename
-
-        results.append(metadata)
-        if (i + 1) % 10 == 0:
-            print(f"Generated {i + 1}/{count} sequences...")
-
-    # Save manifest
+    # Save manifest (without the raw MIDI bytes)
     manifest_path = os.path.join(output_dir, "manifest.json")
     with open(manifest_path, "w") as f:
-        json.dump(results, f, indent=2)
+        json.dump(
+            [{k: v for k, v in m.items() if k != "midi_blob"} for m in results],
+            f, indent=2,
+        )
 
     print(f"\n✅ Generated {count} sequences in '{output_dir}/'")
     print(f"   Manifest saved to {manifest_path}")
@@ -272,5 +403,5 @@ if __name__ == "__main__":
     )
     gen = MidiSequenceGenerator(config)
     pm, meta = gen.generate()
-    pm.write("/tmp/test_sequence.mid")
+    write_midi(pm, "/tmp/test_sequence.mid")
     print(json.dumps(meta, indent=2))
@@ -0,0 +1,48 @@
+"""
+Celery tasks: sequence generation off the Flask request thread
+
+Run a worker with:
+    celery -A tasks worker -Q generation -P threads --loglevel=info
+
+The threads pool matters: prefork children are daemonic and cannot
+spawn the ProcessPoolExecutor the batch task uses, which would silently
+degrade batch generation to zero inserts.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+from celery import Celery
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+
+celery = Celery("musicgen", broker=BROKER_URL, backend=BROKER_URL)
+
+# Heavy generation gets its own queue so light list/stat traffic is
+# never stuck behind it
+celery.conf.task_routes = {
+    "tasks.generate_task": {"queue": "generation"},
+    "tasks.batch_generate_task": {"queue": "generation"},
+}
+
+
+def _json_safe(value):
+    """Round-trip through JSON so DB rows (UUID, Decimal, datetime)
+    survive the result backend."""
+    return json.loads(json.dumps(value, default=str))
+
+
+@celery.task(name="tasks.generate_task")
+def generate_task(body: dict) -> dict:
+    from app import generate_and_store
+    return _json_safe(generate_and_store(body or {}))
+
+
+@celery.task(name="tasks.batch_generate_task")
+def batch_generate_task(count: int) -> dict:
+    from app import batch_generate_and_store
+    return _json_safe(batch_generate_and_store(count))
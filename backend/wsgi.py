@@ -0,0 +1,16 @@
+"""
+WSGI entry point for gunicorn.
+
+Run with:
+    gunicorn -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:app
+
+The gevent worker monkey-patches the stdlib before this module is
+imported, so psycopg's wait loops yield cooperatively and one worker can
+hold many concurrent requests. Keep the POOL size in app.py consistent
+with workers * connections per worker.
+"""
+
+from app import app
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=5000)
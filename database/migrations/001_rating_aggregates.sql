@@ -0,0 +1,37 @@
+-- ============================================================
+-- Migration 001: denormalized rating aggregates on sequences
+-- Lets /api/sequences and /api/stats skip the ratings join.
+-- Fresh databases get these columns from schema.sql directly.
+-- ============================================================
+
+ALTER TABLE sequences
+    ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS rating_sum   INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from existing ratings
+UPDATE sequences s
+SET rating_count = agg.cnt,
+    rating_sum   = agg.total
+FROM (
+    SELECT sequence_id, COUNT(*) AS cnt, SUM(rating) AS total
+    FROM ratings
+    GROUP BY sequence_id
+) agg
+WHERE agg.sequence_id = s.id;
+
+-- idx_ratings_sequence already exists on fresh installs; make sure it
+-- is present on older databases too
+CREATE INDEX IF NOT EXISTS idx_ratings_sequence ON ratings (sequence_id);
+
+-- Rebuild the aggregate view: rating_count is now a base column of
+-- sequences, so the old view definition would duplicate it
+DROP VIEW IF EXISTS sequences_with_ratings;
+CREATE VIEW sequences_with_ratings AS
+SELECT
+    s.*,   -- includes the denormalized rating_count / rating_sum
+    ROUND(s.rating_sum::NUMERIC / NULLIF(s.rating_count, 0), 3) AS avg_rating,
+    MIN(r.rating)               AS min_rating,
+    MAX(r.rating)               AS max_rating
+FROM sequences s
+LEFT JOIN ratings r ON r.sequence_id = s.id
+GROUP BY s.id;
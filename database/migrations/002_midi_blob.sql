@@ -0,0 +1,9 @@
+-- ============================================================
+-- Migration 002: store raw MIDI bytes on sequences
+-- New inserts populate midi_blob; /api/sequences/<id>/midi serves it
+-- directly and falls back to file_path for pre-migration rows.
+-- Fresh databases get this column from schema.sql directly.
+-- ============================================================
+
+ALTER TABLE sequences
+    ADD COLUMN IF NOT EXISTS midi_blob BYTEA;
@@ -34,10 +34,18 @@ CREATE TABLE sequences (
     duration_seconds NUMERIC(8,2),
     pitch_histogram INTEGER[],   -- 12-element array, one per chromatic pitch class
 
+    -- Denormalized rating aggregates, maintained by the rating insert
+    -- (lets list/stat queries skip the ratings join entirely)
+    rating_count    INTEGER NOT NULL DEFAULT 0,
+    rating_sum      INTEGER NOT NULL DEFAULT 0,
+
     -- Full config + stats blob for flexibility
     config_json     JSONB NOT NULL,
     stats_json      JSONB,
 
+    -- Raw MIDI bytes (small, <50 KB) so serving needs no filesystem hit
+    midi_blob       BYTEA,
+
     -- Timestamps
     created_at      TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at      TIMESTAMPTZ NOT NULL DEFAULT NOW()
@@ -75,9 +83,8 @@ CREATE INDEX idx_ratings_rated_at   ON ratings (rated_at DESC);
 -- ─────────────────────────────────────────────
 CREATE VIEW sequences_with_ratings AS
 SELECT
-    s.*,
-    COUNT(r.id)::INTEGER        AS rating_count,
-    ROUND(AVG(r.rating), 3)     AS avg_rating,
+    s.*,   -- includes the denormalized rating_count / rating_sum
+    ROUND(s.rating_sum::NUMERIC / NULLIF(s.rating_count, 0), 3) AS avg_rating,
     MIN(r.rating)               AS min_rating,
     MAX(r.rating)               AS max_rating
 FROM sequences s